@@ -1,274 +1,358 @@
 #!/usr/bin/env python3
 import json
 import argparse
+import functools
+import hashlib
 import sys
 import os
+import io
+import shutil
+import subprocess
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
+# orjson parses large introspection payloads considerably faster; fall back to
+# the standard library when it is not installed.
 try:
-    import graphviz
+    import orjson
+    load_json_bytes = orjson.loads
 except ImportError:
-    sys.exit("Please install the python graphviz package (pip install graphviz) and ensure Graphviz is installed on your system.")
+    load_json_bytes = json.loads
+
+# Scalars that never get their own relationship edges in the diagram.
+BUILT_IN_SCALARS = frozenset({"ID", "String", "Int", "Float", "Boolean", "Date"})
+
+# Introspection kinds that wrap another type through "ofType".
+WRAPPER_KINDS = ('NON_NULL', 'LIST')
+
+# Type categories, assigned once per type by SchemaIndex.
+CAT_OBJECT, CAT_INPUT, CAT_ENUM, CAT_SCALAR = range(4)
 
 #####################
 # Utility Functions #
 #####################
 
+@functools.lru_cache(maxsize=1024)
 def singularize(name):
     """
     A simple heuristic to singularize a field name.
     For example, "posts" becomes "Post" and "categories" becomes "Category".
+    Results are memoized since the same field names recur across types.
     """
-    if name.endswith("ies"):
-        return name[:-3] + "y"
-    elif name.endswith("s"):
+    if name[-3:] == "ies":
+        return name[:-3].capitalize() + "y"
+    if name[-1:] == "s":
         return name[:-1].capitalize()
-    else:
-        return name.capitalize()
+    return name.capitalize()
+
+def sdl_cache_path(raw_bytes, output_path):
+    """
+    Returns the path of the cached SDL for the given introspection bytes,
+    inside a ".sdlcache" directory next to the output file (created if needed).
+    The key also covers this script's source, so a changed converter never
+    reuses SDL produced by an older version.
+    """
+    digest = hashlib.sha256(raw_bytes)
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    cache_dir = os.path.join(os.path.dirname(output_path) or '.', '.sdlcache')
+    os.makedirs(cache_dir, exist_ok=True)
+    return os.path.join(cache_dir, digest.hexdigest() + '.graphql')
+
+def store_sdl_cache(sdl_path, cached_sdl_path):
+    """
+    Copies the generated SDL into the cache. The copy is written under a unique
+    temporary name in the cache directory and only then renamed into place, so
+    an interrupted or concurrent write never leaves a truncated cache entry.
+    """
+    fd, tmp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(cached_sdl_path))
+    try:
+        with os.fdopen(fd, 'wb') as tmp, open(sdl_path, 'rb') as src:
+            shutil.copyfileobj(src, tmp)
+        os.replace(tmp_path, cached_sdl_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+def guess_inner_type(fallback_field_name=None, type_map=None):
+    """
+    Builds a placeholder inner type for a NON_NULL or LIST wrapper whose
+    ofType is missing, guessing the name from the field name when possible.
+    """
+    if fallback_field_name and type_map:
+        candidate = singularize(fallback_field_name)
+        return {"kind": type_map.get(candidate, {}).get("kind", "OBJECT"),
+                "name": candidate,
+                "ofType": None}
+    return {"kind": "OBJECT", "name": "UNKNOWN", "ofType": None}
 
 def convert_type(graphql_type, fallback_field_name=None, type_map=None):
     """
-    Recursively converts an introspection type into its SDL representation.
+    Converts an introspection type into its SDL representation.
+    The NON_NULL/LIST wrappers are walked iteratively, accumulating "[" prefixes
+    and "]"/"!" suffixes around the base type name.
     If inner type information is missing for NON_NULL or LIST,
     we try to guess the type using fallback_field_name and type_map.
     """
     if graphql_type is None:
         return "UNKNOWN"
-    kind = graphql_type.get('kind')
-    if kind == 'NON_NULL':
-        inner = graphql_type.get('ofType')
-        if inner is None:
-            if fallback_field_name and type_map:
-                candidate = singularize(fallback_field_name)
-                inner = {"kind": type_map.get(candidate, {}).get("kind", "OBJECT"),
-                         "name": candidate,
-                         "ofType": None}
-            else:
-                inner = {"kind": "OBJECT", "name": "UNKNOWN", "ofType": None}
-        return f"{convert_type(inner, fallback_field_name, type_map)}!"
-    elif kind == 'LIST':
-        inner = graphql_type.get('ofType')
+    prefix = ''
+    suffix = ''
+    current = graphql_type
+    while True:
+        kind = current.get('kind')
+        if kind == 'NON_NULL':
+            suffix = '!' + suffix
+        elif kind == 'LIST':
+            prefix += '['
+            suffix = ']' + suffix
+        else:
+            break
+        inner = current.get('ofType')
         if inner is None:
-            if fallback_field_name and type_map:
-                candidate = singularize(fallback_field_name)
-                inner = {"kind": type_map.get(candidate, {}).get("kind", "OBJECT"),
-                         "name": candidate,
-                         "ofType": None}
-            else:
-                inner = {"kind": "OBJECT", "name": "UNKNOWN", "ofType": None}
-        return f"[{convert_type(inner, fallback_field_name, type_map)}]"
-    else:
-        return graphql_type.get('name') or "UNKNOWN"
+            inner = guess_inner_type(fallback_field_name, type_map)
+        current = inner
+    return prefix + (current.get('name') or "UNKNOWN") + suffix
 
 def convert_field(field, type_map):
-    """Converts an object field into its SDL representation."""
-    return f"{field['name']}: {convert_type(field['type'], field['name'], type_map)}"
+    """
+    Converts an object field into its SDL representation ("name: Type").
+    Unwrapped types (anything but NON_NULL/LIST) are just their name, so they
+    skip convert_type entirely.
+    """
+    field_type = field['type']
+    if field_type is not None and field_type.get('kind') not in WRAPPER_KINDS:
+        return f"{field['name']}: {field_type.get('name') or 'UNKNOWN'}"
+    return f"{field['name']}: {convert_type(field_type, field['name'], type_map)}"
 
 def convert_input_field(input_field, type_map):
-    """Converts an input field into its SDL representation."""
-    base = f"{input_field['name']}: {convert_type(input_field['type'], input_field['name'], type_map)}"
+    """Converts an input field (and its default value) into its SDL representation."""
+    base = convert_field(input_field, type_map)
     default = input_field.get('defaultValue')
     if default is not None:
         return f"{base} = {default}"
     return base
 
-def get_base_type_name(graphql_type):
+def convert_enum_value(enum_value, type_map=None):
+    """Converts an enum value into its SDL representation."""
+    return enum_value['name']
+
+def type_block_sdl(keyword, name, members, convert_member, type_map=None):
     """
-    Recursively extracts the base type name from a field's type.
-    For example, for [User!]! it returns "User".
+    Converts a type into a "<keyword> <name> { ... }" SDL block, one member per line.
+    None members are skipped.
     """
-    if graphql_type is None:
-        return None
-    if graphql_type.get('ofType'):
-        return get_base_type_name(graphql_type['ofType'])
-    return graphql_type.get('name')
+    body = '\n  '.join([convert_member(member, type_map) for member in members if member is not None])
+    return f"{keyword} {name} {{\n  {body}\n}}"
+
+def quote_dot_id(value):
+    """Quotes a string for use as a DOT identifier or plain-text attribute value."""
+    return '"' + value.replace('\\', '\\\\').replace('"', '\\"') + '"'
 
-def is_list_type(graphql_type):
+def unwrap_type(graphql_type):
     """
-    Checks if a given field type is (or contains) a list.
+    Strips the NON_NULL/LIST wrappers from a field's type in a single loop.
+    Returns (base_type_name, is_list); for example, [User!]! gives ("User", True).
     """
-    if graphql_type is None:
-        return False
-    if graphql_type.get('kind') == 'LIST':
-        return True
-    if graphql_type.get('ofType'):
-        return is_list_type(graphql_type['ofType'])
-    return False
+    is_list = False
+    while graphql_type is not None:
+        if graphql_type.get('kind') == 'LIST':
+            is_list = True
+        inner = graphql_type.get('ofType')
+        if not inner:
+            return graphql_type.get('name'), is_list
+        graphql_type = inner
+    return None, is_list
+
+################
+# Schema Index #
+################
+
+class SchemaIndex:
+    """
+    Pre-processed view of the introspection types, built once and shared by
+    the SDL and diagram generators.
+      - type_map: type name -> introspection type dict.
+      - entries: (name, category, members) for each named type that is
+        not an introspection meta-type ("__" prefix), where
+        category is one of the CAT_* constants and members are its fields,
+        input fields or enum values.
+      - referenceable: names of non built-in scalar types an edge may point to.
+    """
+    __slots__ = ('type_map', 'entries', 'referenceable')
+
+    def __init__(self, introspection_data):
+        types = introspection_data['data']['__schema']['types']
+        self.type_map = {t['name']: t for t in types if t.get('name')}
+        self.entries = []
+        for t in types:
+            if not t.get('name') or t['name'].startswith('__'):
+                continue
+            if t.get('fields') is not None:
+                category, members = CAT_OBJECT, t['fields']
+            elif t.get('inputFields') is not None:
+                category, members = CAT_INPUT, t['inputFields']
+            elif t.get('enumValues') is not None:
+                category, members = CAT_ENUM, t['enumValues']
+            else:
+                category, members = CAT_SCALAR, ()
+            self.entries.append((t['name'], category, members))
+        self.referenceable = set(self.type_map) - BUILT_IN_SCALARS
 
 ###############################
 # SDL & Visual Generation     #
 ###############################
 
-def generate_graphql_schema(introspection_data):
+def write_graphql_schema(index, out):
     """
-    Generates the GraphQL SDL schema string from the introspection data.
+    Writes the GraphQL SDL schema for the schema index to the text stream out,
+    one type block at a time.
     Heuristics:
       - Types with a non-null "fields" list are rendered as objects.
       - Types with "inputFields" are rendered as inputs.
       - Types with "enumValues" are rendered as enums.
       - Otherwise (and if the name does not start with "__"), rendered as scalars.
     """
-    types = introspection_data['data']['__schema']['types']
-    type_map = {t.get('name'): t for t in types if t.get('name')}
-    schema_parts = []
-    for t in types:
-        name = t.get('name')
-        if not name or name.startswith('__'):
+    type_map = index.type_map
+    separator = ''
+    for name, category, fields in index.entries:
+        # Objects and enums without members are omitted entirely.
+        if not fields and (category == CAT_OBJECT or category == CAT_ENUM):
             continue
-        if t.get('fields') is not None:
-            if not t['fields']:
-                continue
-            fields_sdl = '\n  '.join(convert_field(f, type_map) for f in t['fields'] if f is not None)
-            schema_parts.append(f"type {name} {{\n  {fields_sdl}\n}}")
-        elif t.get('inputFields') is not None:
-            fields_sdl = '\n  '.join(convert_input_field(f, type_map) for f in t.get('inputFields', []))
-            schema_parts.append(f"input {name} {{\n  {fields_sdl}\n}}")
-        elif t.get('enumValues') is not None:
-            if not t['enumValues']:
-                continue
-            enum_vals = '\n  '.join(ev['name'] for ev in t.get('enumValues', []))
-            schema_parts.append(f"enum {name} {{\n  {enum_vals}\n}}")
+        if category == CAT_OBJECT:
+            block = type_block_sdl('type', name, fields, convert_field, type_map)
+        elif category == CAT_INPUT:
+            block = type_block_sdl('input', name, fields, convert_input_field, type_map)
+        elif category == CAT_ENUM:
+            block = type_block_sdl('enum', name, fields, convert_enum_value)
         else:
-            schema_parts.append(f"scalar {name}")
-    return "\n\n".join(schema_parts) + "\n"
+            block = f"scalar {name}"
+        out.write(separator + block)
+        separator = '\n\n'
+    out.write('\n')
+
+# HTML-label building blocks for diagram nodes; the header color depends on the category.
+LABEL_TABLE_OPEN = '<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0">'
+LABEL_TABLE_CLOSE = '</TABLE>'
+LABEL_ROW_FMT = "<TR><TD ALIGN='LEFT'>{}</TD></TR>"
+# Node header background colors, indexed by the CAT_* constants.
+COLOR_BY_CATEGORY = ('lightblue', 'lightgreen', 'gold', 'lightgray')
+LABEL_HEADER_BY_CATEGORY = tuple('<TR><TD BGCOLOR="' + color + '"><B>{}</B></TD></TR>'
+                                 for color in COLOR_BY_CATEGORY)
 
-def generate_graphviz_diagram(introspection_data):
+# Escapes type/field text for HTML-like labels in a single C-level pass.
+HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+def generate_graphviz_diagram(index):
     """
-    Generates a Graphviz Digraph (as an SVG) representing the GraphQL schema.
+    Generates the Graphviz DOT source (as a string) representing the GraphQL schema.
     Each type becomes a node with an HTML table label (color-coded by category).
     For types with many fields, only the first few are shown.
-    An edge is added for each field that references a non‑scalar type.
+    An edge is added for each pair of types related by fields referencing a
+    non‑scalar type; several fields between the same pair share one edge.
+    Nodes and edges are collected in a single pass; edges are emitted after all nodes.
     """
-    types = introspection_data['data']['__schema']['types']
-    BUILT_IN_SCALARS = {"ID", "String", "Int", "Float", "Boolean", "Date"}
-    type_map = {t.get('name'): t for t in types if t.get('name')}
-
-    dot = graphviz.Digraph('G', format='svg')
-    dot.attr('node', shape='plaintext')
-    
-    # Create nodes.
-    for t in types:
-        name = t.get('name')
-        if not name or name.startswith("__"):
-            continue
-        # Determine category and fields.
-        category = None
-        fields = []
-        if t.get('fields') is not None:
-            category = "object"
-            fields = t.get('fields', [])
-        elif t.get('inputFields') is not None:
-            category = "input"
-            fields = t.get('inputFields', [])
-        elif t.get('enumValues') is not None:
-            category = "enum"
-            fields = t.get('enumValues', [])
-        else:
-            category = "scalar"
-        
-        # Choose a background color based on category.
-        if category == "object":
-            color = "lightblue"
-        elif category == "input":
-            color = "lightgreen"
-        elif category == "enum":
-            color = "gold"
-        else:
-            color = "lightgray"
-        
-        # Build an HTML label as a table.
-        label_lines = []
-        label_lines.append('<TABLE BORDER="0" CELLBORDER="1" CELLSPACING="0">')
-        # Header row with type name.
-        label_lines.append(f'<TR><TD BGCOLOR="{color}"><B>{name}</B></TD></TR>')
-        
-        # For object/input types, list a few fields.
-        if category in ("object", "input"):
+    type_map = index.type_map
+    referenceable = index.referenceable
+    edges = {}
+
+    buf = io.StringIO()
+    buf.write('digraph G {\n  node [shape=plaintext];\n')
+
+    for name, category, fields in index.entries:
+        # Text of the body rows below the header.
+        rows = []
+
+        # For object/input types, list a few fields and collect relationships.
+        if category == CAT_OBJECT or category == CAT_INPUT:
             max_fields = 5
             count = len(fields)
             for f in fields[:max_fields]:
-                field_label = f"{f['name']}: {convert_type(f['type'], f['name'], type_map)}"
-                label_lines.append(f"<TR><TD ALIGN='LEFT'>{field_label}</TD></TR>")
+                rows.append(convert_field(f, type_map))
             if count > max_fields:
-                label_lines.append(f"<TR><TD ALIGN='LEFT'>... ({count - max_fields} more)</TD></TR>")
-        elif category == "enum":
+                rows.append(f"... ({count - max_fields} more)")
+            for f in fields:
+                base, is_list = unwrap_type(f['type'])
+                if base in referenceable and base != name:
+                    multiplicity = "[*]" if is_list else "[1]"
+                    edges.setdefault((name, base), []).append(f"{f['name']} {multiplicity}")
+        elif category == CAT_ENUM:
             max_vals = 10
             enum_names = [ev['name'] for ev in fields]
             if len(enum_names) > max_vals:
                 enum_text = ", ".join(enum_names[:max_vals]) + f", ... ({len(enum_names)-max_vals} more)"
             else:
                 enum_text = ", ".join(enum_names)
-            label_lines.append(f"<TR><TD ALIGN='LEFT'>Values: {enum_text}</TD></TR>")
-        label_lines.append("</TABLE>")
-        html_label = "".join(label_lines)
-        dot.node(name, label=f"<{html_label}>")
-    
+            rows.append(f"Values: {enum_text}")
+
+        # Build an HTML label as a table with a color-coded header row.
+        html_label = "".join([LABEL_TABLE_OPEN,
+                              LABEL_HEADER_BY_CATEGORY[category].format(name.translate(HTML_ESCAPE_TABLE)),
+                              *[LABEL_ROW_FMT.format(row.translate(HTML_ESCAPE_TABLE)) for row in rows],
+                              LABEL_TABLE_CLOSE])
+        buf.write(f'  {quote_dot_id(name)} [label=<{html_label}>];\n')
+
     # Create edges for relationships.
-    for t in types:
-        src_name = t.get('name')
-        if not src_name or src_name.startswith("__"):
-            continue
-        fields = t.get('fields') or t.get('inputFields')
-        if fields:
-            for f in fields:
-                base = get_base_type_name(f['type'])
-                if base and base not in BUILT_IN_SCALARS and base in type_map and base != src_name:
-                    multiplicity = "[*]" if is_list_type(f['type']) else "[1]"
-                    edge_label = f"{f['name']} {multiplicity}"
-                    dot.edge(src_name, base, label=edge_label)
-    return dot
-
-def generate_visual_html(svg_filepath, html_output_path):
-    """
-    Generates an HTML file that embeds the SVG produced by Graphviz.
-    Also adds a legend on the side (as an HTML block).
-    """
-    try:
-        with open(svg_filepath, 'r') as f:
-            svg_content = f.read()
-    except Exception as e:
-        sys.exit(f"Error reading generated SVG file: {e}")
-    
-    html_content = f"""<!DOCTYPE html>
+    for (src_name, dst_name), edge_labels in edges.items():
+        edge_label = ", ".join(edge_labels)
+        buf.write(f'  {quote_dot_id(src_name)} -> {quote_dot_id(dst_name)} [label={quote_dot_id(edge_label)}];\n')
+    buf.write('}\n')
+    return buf.getvalue()
+
+def write_graphql_schema_file(index, output_path):
+    """Writes the GraphQL SDL schema for the schema index to output_path."""
+    with open(output_path, 'w', buffering=65536) as out:
+        write_graphql_schema(index, out)
+
+def build_and_render_dot(index, svg_output_path, html_output_path):
+    """Builds the DOT source for the schema index and renders it to the SVG and HTML files."""
+    render_visual(generate_graphviz_diagram(index), svg_output_path, html_output_path)
+
+# Static HTML wrapped around the SVG diagram; the SVG is streamed in between.
+HTML_HEAD = """<!DOCTYPE html>
 <html>
 <head>
   <meta charset="utf-8">
   <title>GraphQL Schema Visual Representation</title>
   <style>
-    body {{
+    body {
       font-family: sans-serif;
       margin: 20px;
       display: flex;
       flex-direction: row;
-    }}
-    .diagram {{
+    }
+    .diagram {
       flex: 3;
-    }}
-    .legend {{
+    }
+    .legend {
       flex: 1;
       margin-left: 20px;
       padding: 10px;
       border: 1px solid #ccc;
       background: #f9f9f9;
       font-size: 0.9em;
-    }}
-    .legend ul {{
+    }
+    .legend ul {
       list-style: none;
       padding-left: 0;
-    }}
-    .legend li {{
+    }
+    .legend li {
       margin-bottom: 5px;
-    }}
-    .legend span.box {{
+    }
+    .legend span.box {
       display: inline-block;
       width: 12px;
       height: 12px;
       margin-right: 5px;
-    }}
+    }
   </style>
 </head>
 <body>
 <div class="diagram">
-{svg_content}
+"""
+
+HTML_TAIL = """
 </div>
 <div class="legend">
   <h3>Legend</h3>
@@ -284,12 +368,49 @@ def generate_visual_html(svg_filepath, html_output_path):
 </body>
 </html>
 """
+
+def render_visual(dot_source, svg_output_path, html_output_path):
+    """
+    Pipes DOT source through the Graphviz "dot" executable and streams the SVG
+    from its stdout into both the standalone SVG file and an HTML file that
+    embeds it next to a legend, so the SVG is never re-read from disk.
+    Both files are written under a ".tmp" name and only replace the outputs
+    once dot has succeeded, so a failed render leaves earlier outputs intact.
+    """
+    svg_tmp_path = svg_output_path + '.tmp'
+    html_tmp_path = html_output_path + '.tmp'
+    proc = subprocess.Popen(['dot', '-Tsvg'], stdin=subprocess.PIPE, stdout=subprocess.PIPE)
     try:
-        with open(html_output_path, 'w') as f:
-            f.write(html_content)
-        print(f"Visual HTML representation has been written to {html_output_path}")
-    except Exception as e:
-        sys.exit(f"Error writing visual HTML file: {e}")
+        try:
+            # dot only starts writing once it has read the whole graph, so the
+            # input can be written in full before reading the output. If dot
+            # exits early the pipe breaks; its exit status is reported below.
+            try:
+                proc.stdin.write(dot_source.encode('utf-8'))
+            except BrokenPipeError:
+                pass
+            try:
+                proc.stdin.close()
+            except BrokenPipeError:
+                pass
+            with open(svg_tmp_path, 'wb') as svg, open(html_tmp_path, 'wb') as html:
+                html.write(HTML_HEAD.encode('utf-8'))
+                for chunk in iter(functools.partial(proc.stdout.read, 65536), b''):
+                    svg.write(chunk)
+                    html.write(chunk)
+                html.write(HTML_TAIL.encode('utf-8'))
+        finally:
+            proc.stdout.close()
+            returncode = proc.wait()
+        if returncode != 0:
+            raise subprocess.CalledProcessError(returncode, proc.args)
+        os.replace(svg_tmp_path, svg_output_path)
+        os.replace(html_tmp_path, html_output_path)
+    except BaseException:
+        for path in (svg_tmp_path, html_tmp_path):
+            if os.path.exists(path):
+                os.remove(path)
+        raise
 
 #####################
 # Main Entry Point  #
@@ -305,44 +426,84 @@ def main():
                         help="Path to the output .graphql file")
     parser.add_argument("-v", "--visual", action="store_true",
                         help="Generate a visual SVG and HTML representation of the schema")
+    parser.add_argument("-c", "--cache", action="store_true",
+                        help="Reuse the SDL generated earlier for identical input (stored in .sdlcache next to the output)")
     args = parser.parse_args()
 
+    if args.visual and shutil.which('dot') is None:
+        sys.exit("Please ensure Graphviz is installed on your system (the 'dot' executable must be on your PATH).")
+
     # Read the introspection JSON.
     try:
-        with open(args.file, 'r') as f:
-            introspection_data = json.load(f)
+        with open(args.file, 'rb') as f:
+            raw_bytes = f.read()
     except Exception as e:
         sys.exit(f"Error reading input file: {e}")
 
-    # Generate the GraphQL SDL schema.
+    # With --cache, an identical input reuses the SDL generated last time.
+    cached_sdl_path = None
+    sdl_from_cache = False
+    if args.cache:
+        try:
+            cached_sdl_path = sdl_cache_path(raw_bytes, args.output)
+            if os.path.exists(cached_sdl_path):
+                shutil.copyfile(cached_sdl_path, args.output)
+                sdl_from_cache = True
+                print(f"GraphQL SDL schema has been written to {args.output} (from cache)")
+        except Exception as e:
+            sys.exit(f"Error using SDL cache: {e}")
+        if sdl_from_cache and not args.visual:
+            return
+
     try:
-        graphql_schema = generate_graphql_schema(introspection_data)
+        introspection_data = load_json_bytes(raw_bytes)
     except Exception as e:
-        sys.exit(f"Error generating GraphQL schema: {e}")
+        sys.exit(f"Error reading input file: {e}")
 
-    # Write the SDL to the output file.
+    # Index the introspection types once for both generators.
     try:
-        with open(args.output, 'w') as out:
-            out.write(graphql_schema)
-        print(f"GraphQL SDL schema has been written to {args.output}")
+        index = SchemaIndex(introspection_data)
     except Exception as e:
-        sys.exit(f"Error writing to output file: {e}")
+        sys.exit(f"Error reading introspection schema: {e}")
 
-    # If visual output is requested, generate an SVG diagram and an HTML file.
+    # With --visual, start the Graphviz render in a worker thread first; the
+    # dot subprocess runs outside the GIL, so the SDL write below overlaps it.
+    executor = None
     if args.visual:
         base, _ = os.path.splitext(args.output)
         svg_output_path = base + ".svg"
         html_output_path = base + ".html"
+        executor = ThreadPoolExecutor(max_workers=1)
+        svg_future = executor.submit(build_and_render_dot, index, svg_output_path, html_output_path)
 
+    sdl_error = None
+    if not sdl_from_cache:
         try:
-            dot = generate_graphviz_diagram(introspection_data)
-            # Capture the actual rendered file path.
-            rendered_svg_path = dot.render(svg_output_path, format='svg', cleanup=True)
-            print(f"Graphviz SVG diagram has been written to {rendered_svg_path}")
+            write_graphql_schema_file(index, args.output)
         except Exception as e:
-            sys.exit(f"Error generating Graphviz diagram: {e}")
+            sdl_error = e
 
-        generate_visual_html(rendered_svg_path, html_output_path)
+    svg_error = None
+    if executor is not None:
+        svg_error = svg_future.exception()
+        executor.shutdown()
+
+    if not sdl_from_cache:
+        if sdl_error is not None:
+            sys.exit(f"Error generating GraphQL schema: {sdl_error}")
+        print(f"GraphQL SDL schema has been written to {args.output}")
+
+        if cached_sdl_path:
+            try:
+                store_sdl_cache(args.output, cached_sdl_path)
+            except Exception as e:
+                sys.exit(f"Error writing SDL cache: {e}")
+
+    if args.visual:
+        if svg_error is not None:
+            sys.exit(f"Error generating Graphviz diagram: {svg_error}")
+        print(f"Graphviz SVG diagram has been written to {svg_output_path}")
+        print(f"Visual HTML representation has been written to {html_output_path}")
 
 if __name__ == "__main__":
     main()